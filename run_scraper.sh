@@ -101,9 +101,9 @@ fi
 echo "   ✅ Dependencies installed/updated successfully."
 log_audit "Dependencies installed/updated from ${REQUIREMENTS_FILE}."
 
-# 5. Run the Python Scraper
+# 5. Run the Python Scraper (any arguments to this script, e.g. --debug, are passed through)
 echo "▶️ Running the Python scraper (${PYTHON_SCRIPT})..."
-"${PYTHON_EXEC}" "${PYTHON_SCRIPT}"
+"${PYTHON_EXEC}" "${PYTHON_SCRIPT}" "$@"
 SCRIPT_EXIT_CODE=$? # Capture exit code of the Python script
 
 if [ ${SCRIPT_EXIT_CODE} -ne 0 ]; then
@@ -0,0 +1,95 @@
+# src/github_api.py
+"""GitHub REST API client used by scraper.py when GITHUB_TOKEN and GITHUB_ORG are set."""
+import json
+import logging
+import time
+import requests
+
+# --- Configuration ---
+GITHUB_API_URL = "https://api.github.com"
+API_TIMEOUT = 20  # seconds to wait for an API response
+API_PAGE_SIZE = 100  # maximum page size supported by GitHub's list endpoints
+API_MAX_RETRIES = 3  # retries of a rate-limited request before giving up
+API_RATE_LIMIT_LOG_INTERVAL = 10  # log the remaining rate limit every N API requests
+
+class GitHubApiClient:
+    """Minimal authenticated GitHub REST API client; one keep-alive requests.Session is shared by all calls.
+
+    Responses that carry an ETag are kept in `self.cache`, loaded from `cache_file`; the caller saves it back
+    after the run. Repeat requests send If-None-Match and reuse the cached body on 304 Not Modified, which GitHub
+    does not count against the rate limit.
+    """
+
+    def __init__(self, api_token, cache_file, base_url=GITHUB_API_URL):
+        self.base_url = base_url
+        self.cache_file = cache_file
+        self.cache = self._load_cache()
+        self.request_count = 0
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_token}",
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+        })
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {} # Missing or unreadable cache; start empty.
+
+    def _request_with_rate_limit(self, url, headers):
+        """GETs `url`, waiting out rate limits as GitHub instructs instead of retrying blindly."""
+        for attempt in range(API_MAX_RETRIES + 1):
+            response = self.session.get(url, headers=headers, timeout=API_TIMEOUT)
+            self.request_count += 1
+            if self.request_count % API_RATE_LIMIT_LOG_INTERVAL == 0:
+                logging.info(f"GitHub API requests made: {self.request_count}; rate limit remaining: {response.headers.get('X-RateLimit-Remaining', 'unknown')}.")
+            delay = self._rate_limit_delay(response, attempt)
+            if delay is None or attempt == API_MAX_RETRIES:
+                return response
+            logging.warning(f"⏳ GitHub API rate limit hit (HTTP {response.status_code}); retrying in {delay} seconds...")
+            time.sleep(delay)
+
+    @staticmethod
+    def _rate_limit_delay(response, attempt):
+        """Returns the seconds to wait before retrying a rate-limited response, or None if it was not rate limited."""
+        if response.status_code not in (403, 429):
+            return None
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            return max(1, int(retry_after))
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            return max(1, int(response.headers.get("X-RateLimit-Reset", 0)) - int(time.time()))
+        if response.status_code == 429 or "rate limit" in response.text.lower():
+            # Secondary rate limit without headers: GitHub asks for at least a minute, then exponential backoff.
+            return 60 * 2 ** attempt
+        return None # A plain 403 (e.g. missing permissions) is not retried
+
+    def get_json(self, path, params=None):
+        """GETs an API path (or absolute URL). Returns the parsed JSON and the next page URL (or None)."""
+        url = path if path.startswith("https://") else f"{self.base_url}{path}"
+        url = requests.Request("GET", url, params=params).prepare().url
+        cached = self.cache.get(url)
+        headers = {"If-None-Match": cached["etag"]} if cached else None
+        response = self._request_with_rate_limit(url, headers)
+        if response.status_code == 304:
+            logging.debug("Not modified; reusing cached response for %s", url)
+            return cached["data"], cached["next"]
+        response.raise_for_status()
+        data = response.json()
+        next_url = response.links.get("next", {}).get("url")
+        if response.headers.get("ETag"):
+            self.cache[url] = {"etag": response.headers["ETag"], "data": data, "next": next_url}
+        return data, next_url
+
+    def paginate(self, path, params=None):
+        """Yields every item of a list endpoint, following the Link: rel="next" header across pages."""
+        url = path
+        params = {**(params or {}), "per_page": API_PAGE_SIZE}
+        while url:
+            data, url = self.get_json(url, params)
+            yield from data
+            # The "next" link already carries the query string, so params are only sent with the first request.
+            params = None
@@ -1,23 +1,107 @@
 # src/scraper.py
+import argparse
 import csv
+import hashlib
+import json
 import logging
-import time
+import queue
+from contextlib import contextmanager
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
 import os # Added for saving page source optionally
-from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+import time
+from datetime import date, datetime
+import lxml.html
+from lxml.cssselect import CSSSelector
+import requests
+# Selenium is imported inside the functions that drive Chrome, so API and saved-session runs never load it.
 
 # --- Configuration ---
 GITHUB_TOKENS_URL = "https://github.com/settings/tokens"
 OUTPUT_FILE = "output/classic_pats_report.csv"
+CSV_HEADERS = ("Token Name", "Expiration Date")  # scraped rows are (name, expiration) tuples in this order
 LOG_FILE = "logs/scraper.log"
+LOG_LEVEL = logging.DEBUG if os.environ.get("SCRAPER_DEBUG") == "1" else logging.INFO  # SCRAPER_DEBUG=1 or --debug for row HTML snippets
 PAGE_SOURCE_LOG_FILE = "output/page_source_at_timeout.html" # For dumping page source on error
 WAIT_TIMEOUT = 20  # seconds to wait for elements to appear
+NAVIGATION_SETTLE_TIMEOUT = 5  # seconds to wait for the first page (login or tokens) after navigating
+CACHE_DIR = os.path.expanduser("~/.cache/github_pat_scraper")  # Chrome profile and API response cache
+ISO_DATE_FORMAT = '%Y-%m-%d'  # format of dates read from <relative-time> and API timestamps
+TOKEN_ROWS_RETRY_DELAY = 0.5  # seconds before checking for token rows once more, in case the list renders late
+POLL_FREQUENCY = 0.1  # seconds between checks in page waits (Selenium's default of 0.5s adds up to 0.4s per wait)
+
+# --- Optional API mode ---
+# GitHub has no REST endpoint listing a user's own classic PATs, but organizations using SAML SSO expose
+# every credential their members have authorized. When both GITHUB_TOKEN and GITHUB_ORG are set, the
+# script reads the authenticated user's classic PATs from that endpoint in a few HTTP requests and skips
+# Chrome entirely. Without them it falls back to scraping the settings page with Selenium (below).
+# Two limits apply to this mode:
+#   - /orgs/{org}/credential-authorizations is only available to organization owners, and GITHUB_TOKEN
+#     needs the read:org scope. Other members get HTTP 403 and should use the browser scrape instead.
+#   - Only tokens SSO-authorized for the listed organizations are reported, so the report can be a subset
+#     of the classic PATs shown on the settings page.
+# The REST client lives in github_api.py and is only imported in this mode.
+GITHUB_API_TOKEN = os.environ.get("GITHUB_TOKEN")
+# Comma-separated to cover several organizations, e.g. GITHUB_ORG=acme,acme-labs
+GITHUB_ORGS = [org.strip() for org in os.environ.get("GITHUB_ORG", "").split(",") if org.strip()]
+API_CACHE_FILE = os.path.join(CACHE_DIR, "api_cache.json")  # ETag-keyed API responses
+
+# --- Optional browserless session mode ---
+# Set SAVE_SESSION_COOKIES=1 to save the github.com session cookies here (owner-readable only) after a successful
+# browser run. Later runs then fetch the tokens page with plain HTTP using those cookies and parse it with lxml,
+# starting Chrome only if the session has expired. The file holds a live login session (anyone with it is signed
+# in as you, without 2FA), so it is off by default; runs without SAVE_SESSION_COOKIES=1 delete it if present.
+SAVE_SESSION_COOKIES = os.environ.get("SAVE_SESSION_COOKIES") == "1"
+SESSION_COOKIES_FILE = os.path.join(CACHE_DIR, "github_cookies.json")
+# The tokens page's ETag and a hash of the report written from it. The next fetch sends If-None-Match, and a 304 Not
+# Modified keeps the existing report as long as it is unchanged on disk.
+TOKENS_PAGE_CACHE_FILE = os.path.join(CACHE_DIR, "tokens_page_cache.json")
+TOKENS_PAGE_NOT_MODIFIED = object()  # returned by fetch_tokens_page_with_cookies() on 304 Not Modified
+
+# --- ChromeDriver resolution ---
+# Selenium Manager (bundled with Selenium 4.11+) finds or downloads a chromedriver matching the installed Chrome
+# and caches it under ~/.cache/selenium. Set CHROMEDRIVER_PATH to use a specific chromedriver binary instead.
+CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH")
+
+# --- Chrome options ---
+CHROME_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36"
+# Chrome keeps its profile (including the GitHub session cookie) here between runs. The first run needs a manual
+# login; later runs open the tokens page already authenticated and skip the login wait entirely.
+# Delete this directory to sign out.
+CHROME_PROFILE_DIR = os.path.join(CACHE_DIR, "chrome-profile")
+# Set HEADLESS=1 to run Chrome without a window once you no longer need to log in interactively.
+HEADLESS = os.environ.get("HEADLESS") == "1"
+# Subsystems the scraper never uses; turning them off shortens Chrome start-up and page loads.
+CHROME_PERFORMANCE_ARGUMENTS = (
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,InterestFeedContentSuggestions",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+)
+# Only used with HEADLESS=1, since there is no window to log in with.
+CHROME_HEADLESS_ARGUMENTS = (
+    "--headless=new",
+)
+# Chrome refuses to start as root with its sandbox enabled, which is the usual case in containers. The sandbox is
+# only disabled then, or when CHROME_NO_SANDBOX=1 is set; on a workstation the profile signed in to GitHub keeps it.
+CHROME_NO_SANDBOX = os.environ.get("CHROME_NO_SANDBOX") == "1" or (hasattr(os, "geteuid") and os.geteuid() == 0)
+# Content settings applied to the profile: 2 = block. Images are never read by the scraper (this is the only place
+# they are blocked, and it also covers extension-less URLs such as avatars), and notification permission prompts
+# would only get in the way of the login window.
+CHROME_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+}
+# Requests blocked through the DevTools protocol: fonts and GitHub's analytics collector. The token rows are in the
+# server-rendered HTML, so the scrape does not depend on any of these.
+BLOCKED_URL_PATTERNS = ("*.woff", "*.woff2", "*collector*", "*analytics*")
+# Stylesheets are only blocked in headless mode, so the interactive login page stays readable.
+HEADLESS_BLOCKED_URL_PATTERNS = ("*.css",)
 
 # --- CSS Selectors (These might change if GitHub updates its UI) ---
 TOKEN_PAGE_IDENTIFIER_ELEMENT_XPATH = "//h2[contains(text(), 'Personal access tokens (classic)')]"
@@ -32,9 +116,9 @@ TOKEN_PAGE_IDENTIFIER_ELEMENT_XPATH = "//h2[contains(text(), 'Personal access to
 #   - NEW_TOKEN_EXPIRATION_TEXT_SELECTOR = 'div span.color-fg-attention > a.color-fg-attention' (for expiration text like "Expired on ...")
 #   - Fallback for expiration: The code also checks for a <relative-time> tag if the above selector fails.
 #
-# If `scrape_tokens` times out waiting for `TOKEN_ROWS_SELECTOR` (no token rows found):
+# If `scrape_tokens` finds no elements matching `TOKEN_ROWS_SELECTOR` (no token rows found):
 # 1. This means `TOKEN_ROWS_SELECTOR` is likely outdated.
-# 2. The script *should* save the page HTML to `output/page_source_at_timeout.html`.
+# 2. Re-run with --debug: the script then saves the page's <main> HTML to `output/page_source_at_timeout.html`.
 #    Inspect this file to understand the current HTML structure for token rows.
 # 3. Use browser developer tools (Ctrl+Shift+I or Cmd+Option+I) on the live GitHub tokens page:
 #    a. Inspect an individual token row element.
@@ -44,7 +128,7 @@ TOKEN_PAGE_IDENTIFIER_ELEMENT_XPATH = "//h2[contains(text(), 'Personal access to
 #       It should return a list of all token row elements.
 #
 # If token rows ARE found, but parsing fails for name or expiration (e.g., "N/A (Not Found)"):
-# 1. Examine the "Row X HTML snippet" logged for each processed row. This shows the HTML the script sees.
+# 1. Re-run with --debug (or SCRAPER_DEBUG=1) and examine the "Row X HTML snippet" logged for each processed row. This shows the HTML the script sees.
 # 2. This snippet will help you verify if `TOKEN_NAME_SELECTOR` or `NEW_TOKEN_EXPIRATION_TEXT_SELECTOR`
 #    (and the <relative-time> fallback) are still valid within the row's structure.
 # 3. Adjust these selectors based on the logged HTML snippet or by inspecting `page_source_at_timeout.html`
@@ -56,149 +140,250 @@ TOKEN_ROWS_SELECTOR = 'div.access-token[id^="access-token-"]' # Updated June 202
 TOKEN_NAME_SELECTOR = 'span.token-description > strong > a' # Updated June 2024
 # For tokens that show "Expired on..." or similar text. Updated June 2024.
 NEW_TOKEN_EXPIRATION_TEXT_SELECTOR = 'div span.color-fg-attention > a.color-fg-attention'
+EXPIRED_ON_PREFIX = "Expired on "  # expiration text of expired tokens, followed by the date
+NO_EXPIRATION = "No expiration"  # reported for tokens without an expiration date, and matched in the page text
+_NO_EXPIRATION_LOWER = NO_EXPIRATION.lower()  # for case-insensitive matching of <relative-time> text
 # Old selectors TOKEN_EXPIRATION_SELECTOR_RELATIVE_TIME and EXPIRY_TEXT_CONTAINER_SELECTOR_FALLBACK were removed
 # as the expiration parsing logic has been updated (June 2024) to use NEW_TOKEN_EXPIRATION_TEXT_SELECTOR
 # and a <relative-time> tag fallback.
+
+# Compiled once at import: lxml's cssselect() otherwise re-translates the CSS into XPath on every call, i.e. per row.
+_TOKEN_ROWS_SEL = CSSSelector(TOKEN_ROWS_SELECTOR)
+_TOKEN_NAME_SEL = CSSSelector(TOKEN_NAME_SELECTOR)
+_TOKEN_EXPIRATION_SEL = CSSSelector(NEW_TOKEN_EXPIRATION_TEXT_SELECTOR)
+_RELATIVE_TIME_SEL = CSSSelector('relative-time')
+
+# Returns the outerHTML of every token row, so only the rows rather than the whole page (page_source) are
+# serialized and sent back over the WebDriver connection.
+TOKEN_ROWS_HTML_JS = "return Array.from(document.querySelectorAll(arguments[0]), row => row.outerHTML);"
+# Page content saved for debugging when no token rows are found.
+MAIN_CONTENT_HTML_JS = "return (document.querySelector('main') || document.body).outerHTML;"
+
 # --- Logging Setup ---
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] - %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_FILE, mode='w'), # Overwrite log file each run
-        logging.StreamHandler()
-    ]
-)
+# Logging calls only put records on a queue. The QueueListener started in main() writes them to the log file
+# and the console from a background thread, so file and terminal I/O stay out of the scraping loop.
+LOG_FORMAT = "%(asctime)s [%(levelname)s] - %(message)s"
+LOG_FILE_BUFFER_RECORDS = 1024  # records buffered before the log file is written; errors are written immediately
+log_queue = queue.Queue(-1)
+queue_handler = QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter("%(message)s")) # The listener's handlers apply LOG_FORMAT
+logging.basicConfig(level=LOG_LEVEL, handlers=[queue_handler])
+# Debug mode is for this script's own messages only. At DEBUG, Selenium logs every WebDriver response in full,
+# including the session cookies returned by get_cookies(), so these libraries are held at INFO.
+for library_logger in ("selenium", "urllib3"):
+    logging.getLogger(library_logger).setLevel(logging.INFO)
+
+def start_log_listener():
+    """Starts and returns the listener that writes queued log records to LOG_FILE and the console.
+
+    Call stop_log_listener() with the result to write out any records still buffered.
+    """
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = logging.FileHandler(LOG_FILE, mode='w') # Overwrite log file each run
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+    # Batches log file writes instead of writing and flushing the file once per record.
+    buffered_file_handler = MemoryHandler(LOG_FILE_BUFFER_RECORDS, flushLevel=logging.ERROR, target=file_handler)
+    listener = QueueListener(log_queue, buffered_file_handler, stream_handler)
+    listener.start()
+    return listener
+
+def stop_log_listener(listener):
+    """Stops the log listener once every queued record is handled, then writes and closes the log file."""
+    listener.stop()
+    for handler in listener.handlers:
+        if isinstance(handler, MemoryHandler):
+            handler.flush()
+            handler.target.close()
+        handler.close()
+
+def make_private_dir(path):
+    """Creates directory `path` if needed and restricts it to its owner (mode 0700).
+
+    The chmod also tightens directories created by earlier versions, where makedirs applied the umask default.
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    os.chmod(path, 0o700)
 
 def setup_driver():
     """Initializes and returns a Selenium Chrome WebDriver."""
     logging.info("Setting up Chrome WebDriver...")
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
     try:
-        service = Service(ChromeDriverManager().install())
+        service = Service(CHROMEDRIVER_PATH) # None lets Selenium Manager resolve the driver
         chrome_options = webdriver.ChromeOptions()
+        make_private_dir(CACHE_DIR)
+        make_private_dir(CHROME_PROFILE_DIR) # Holds the GitHub session; owner access only
+        chrome_options.add_argument(f"--user-data-dir={CHROME_PROFILE_DIR}")
+        chrome_options.add_argument("--profile-directory=Default")
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--window-size=1280x800")
-        chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36")
+        chrome_options.add_argument(f"user-agent={CHROME_USER_AGENT}")
+        for argument in CHROME_PERFORMANCE_ARGUMENTS:
+            chrome_options.add_argument(argument)
+        if HEADLESS:
+            logging.info("HEADLESS=1 is set; starting Chrome in headless mode.")
+            for argument in CHROME_HEADLESS_ARGUMENTS:
+                chrome_options.add_argument(argument)
+        if CHROME_NO_SANDBOX:
+            chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_experimental_option("prefs", CHROME_PREFS)
+        # driver.get returns once the DOM is parsed instead of waiting for every subresource; the explicit
+        # waits on the tokens header and rows still guarantee the elements are there before they are read.
+        chrome_options.page_load_strategy = "eager"
         driver = webdriver.Chrome(service=service, options=chrome_options)
+        blocked_url_patterns = BLOCKED_URL_PATTERNS + (HEADLESS_BLOCKED_URL_PATTERNS if HEADLESS else ())
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(blocked_url_patterns)})
         logging.info("✅ Chrome WebDriver setup complete.")
         return driver
     except Exception as e:
         logging.error(f"❌ Failed to setup Chrome WebDriver: {e}", exc_info=True)
-        logging.error("Ensure Google Chrome is installed. If issues persist with chromedriver download, you might need to install it manually and adjust the script or your system PATH.")
+        logging.error("Ensure Google Chrome is installed. If issues persist with chromedriver download, install it manually and point CHROMEDRIVER_PATH at the binary.")
         raise
 
 def check_login_and_navigate(driver):
     """Navigates to the tokens page and checks if the user is logged in."""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    token_page_present = EC.presence_of_element_located((By.XPATH, TOKEN_PAGE_IDENTIFIER_ELEMENT_XPATH))
     logging.info(f"Navigating to {GITHUB_TOKENS_URL}...")
     driver.get(GITHUB_TOKENS_URL)
-    time.sleep(3) 
+    # Continue as soon as either the login redirect or the tokens page header is present, instead of a fixed sleep.
+    try:
+        WebDriverWait(driver, NAVIGATION_SETTLE_TIMEOUT, poll_frequency=POLL_FREQUENCY).until(EC.any_of(token_page_present, EC.url_contains("login")))
+    except TimeoutException:
+        logging.info(f"Neither the login page nor the tokens page was detected within {NAVIGATION_SETTLE_TIMEOUT} seconds; checking the current page.")
 
     current_url_lower = driver.current_url.lower()
     page_title_lower = driver.title.lower()
 
     if "login" in current_url_lower or "auth" in current_url_lower or "sign in" in page_title_lower:
         logging.warning("⚠️ It seems you are not logged into GitHub in this browser session.")
+        if HEADLESS:
+            # There is no window to log in with, so waiting for a login would only burn the full timeout.
+            logging.error("❌ HEADLESS=1 is set, so there is no browser window to log in with.")
+            logging.error(f"Run the scraper once without HEADLESS to log in; the session is then kept in {CHROME_PROFILE_DIR}.")
+            return False
         logging.info("Please log in to GitHub in the opened browser window.")
         logging.info("Once logged in and on the 'Personal access tokens (classic)' page, the script will attempt to continue.")
+        logging.info(f"The session is kept in the Chrome profile at {CHROME_PROFILE_DIR}, so later runs will not ask again.")
         try:
-            WebDriverWait(driver, 300).until( 
-                EC.presence_of_element_located((By.XPATH, TOKEN_PAGE_IDENTIFIER_ELEMENT_XPATH))
-            )
+            WebDriverWait(driver, 300).until(token_page_present) # Default polling; the user's login dominates here
             logging.info("✅ Successfully detected navigation to the tokens page after potential login.")
-            driver.get(GITHUB_TOKENS_URL) 
-            WebDriverWait(driver, WAIT_TIMEOUT).until(
-                EC.presence_of_element_located((By.XPATH, TOKEN_PAGE_IDENTIFIER_ELEMENT_XPATH))
-            )
         except TimeoutException:
             logging.error("❌ Timed out waiting for login or navigation to the tokens page.", exc_info=True)
             logging.error("Please ensure you are logged in and can manually access the classic tokens page: " + GITHUB_TOKENS_URL)
             return False
     
     try:
-        WebDriverWait(driver, WAIT_TIMEOUT).until(
-            EC.presence_of_element_located((By.XPATH, TOKEN_PAGE_IDENTIFIER_ELEMENT_XPATH))
-        )
+        WebDriverWait(driver, WAIT_TIMEOUT, poll_frequency=POLL_FREQUENCY).until(token_page_present)
         logging.info("✅ Successfully on the 'Personal access tokens (classic)' page.")
         return True
     except TimeoutException:
         logging.error(f"❌ Failed to find the classic tokens page identifier: '{TOKEN_PAGE_IDENTIFIER_ELEMENT_XPATH}'.", exc_info=True)
         return False
 
+def element_text(element):
+    """Returns an lxml element's text with whitespace collapsed, like the text a browser renders for it."""
+    return " ".join(element.text_content().split())
+
+def iso_date(timestamp):
+    """Returns the YYYY-MM-DD date of a GitHub ISO 8601 timestamp such as '2025-05-22T12:00:00Z'.
+
+    Raises ValueError for malformed timestamps and impossible dates such as '2025-13-99'.
+    """
+    # GitHub timestamps start with the calendar date, so only that prefix is validated and returned; anything
+    # else is fully parsed.
+    if timestamp[4:5] == timestamp[7:8] == "-":
+        return date.fromisoformat(timestamp[:10]).isoformat()
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).strftime(ISO_DATE_FORMAT)
+
 def scrape_tokens(driver):
-    """Scrapes classic PATs from the current page."""
+    """Scrapes classic PATs from the current page, yielding a (name, expiration) tuple for each one."""
     logging.info("🔍 Starting token scraping process...")
-    tokens_data = []
-
-    try:
-        logging.info(f"Attempting to find token rows with NEW CSS selector: '{TOKEN_ROWS_SELECTOR}'")
-        # Wait for at least one element matching the selector, or timeout.
-        token_rows = WebDriverWait(driver, WAIT_TIMEOUT).until(
-            EC.presence_of_all_elements_located((By.CSS_SELECTOR, TOKEN_ROWS_SELECTOR))
-        )
-        # If the above does not time out, token_rows will be a list of found elements.
-        # If it times out (because no elements found), the except TimeoutException block below will handle it.
+    logging.info(f"Attempting to find token rows with NEW CSS selector: '{TOKEN_ROWS_SELECTOR}'")
+    # check_login_and_navigate already waited for the page header, so the server-rendered rows are there too.
+    # Fetch just the rows' HTML in one WebDriver call, then parse it in-process with lxml (libxml2)
+    # instead of querying each row's fields over WebDriver. An empty result is checked once more after a short
+    # delay, rather than polling until WAIT_TIMEOUT, so accounts without classic tokens finish straight away.
+    rows_html = driver.execute_script(TOKEN_ROWS_HTML_JS, TOKEN_ROWS_SELECTOR)
+    if not rows_html:
+        time.sleep(TOKEN_ROWS_RETRY_DELAY)
+        rows_html = driver.execute_script(TOKEN_ROWS_HTML_JS, TOKEN_ROWS_SELECTOR)
 
-    except TimeoutException:
-        logging.warning(f"⏰ Timed out waiting for token rows using selector: '{TOKEN_ROWS_SELECTOR}'. This means no elements matched this selector within {WAIT_TIMEOUT} seconds.")
+    if not rows_html:
+        logging.warning(f"No token rows found using selector: '{TOKEN_ROWS_SELECTOR}'.")
         logging.info("This could be because there are no classic tokens, or the page structure has changed significantly.")
+        if not logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.info(f"If you do have classic tokens, re-run with --debug to save the page HTML to {PAGE_SOURCE_LOG_FILE}.")
+            return # No tokens found/matched
         try:
-            page_source = driver.page_source
-            logging.info(f"Page source at time of timeout (first 3000 chars):\n{page_source[:3000]}")
-            # Save the full page source to a file for detailed inspection
+            # Only the <main> content holds the token list; skipping the rest of the document keeps the dump small.
+            page_source = driver.execute_script(MAIN_CONTENT_HTML_JS)
+            logging.debug(f"Page <main> HTML when no token rows were found (first 3000 chars):\n{page_source[:3000]}")
+            # Save the HTML to a file for detailed inspection
             with open(PAGE_SOURCE_LOG_FILE, "w", encoding="utf-8") as f:
                f.write(page_source)
-            logging.info(f"Full page source saved to {PAGE_SOURCE_LOG_FILE} for debugging.")
+            logging.info(f"Page <main> HTML saved to {PAGE_SOURCE_LOG_FILE} for debugging.")
         except Exception as e_ps:
-            logging.error(f"Could not get/save page source after timeout: {e_ps}")
-        return [] # Return empty list as no tokens found/matched
+            logging.error(f"Could not get/save page source: {e_ps}")
+        return # No tokens found/matched
+
+    yield from parse_token_rows(lxml.html.fragment_fromstring("".join(rows_html), create_parent="div"))
 
-    # If we are here, token_rows contains one or more elements
-    if not token_rows: # Should not happen if WebDriverWait worked as expected, but as a safeguard.
-        logging.info(f"ℹ️ No token rows found (list is empty) even after WebDriverWait did not time out using selector '{TOKEN_ROWS_SELECTOR}'. This is unexpected.")
-        return []
+def parse_token_rows(tree):
+    """Parses the token rows in an lxml `tree`, yielding a (name, expiration) tuple for each classic PAT.
 
+    Rows are produced one at a time, so they go straight from the parser into csv.writer.writerows().
+    """
+    debug_enabled = logging.getLogger().isEnabledFor(logging.DEBUG)
+    token_count = 0
+    token_rows = _TOKEN_ROWS_SEL(tree)
     logging.info(f"Found {len(token_rows)} potential token entries/rows based on selector '{TOKEN_ROWS_SELECTOR}'.")
 
+    # Log calls in this loop use %-style arguments so messages are only formatted when the level is enabled.
     for i, row_element in enumerate(token_rows):
-        logging.info(f"--- Processing potential token row {i+1}/{len(token_rows)} ---")
-        try:
-            row_html_snippet = row_element.get_attribute('outerHTML')[:700] 
-            logging.info(f"Row {i+1} HTML snippet: {row_html_snippet} ...")
-        except Exception as e_html:
-            logging.warning(f"Could not get HTML for row {i+1}: {e_html}")
+        logging.debug("--- Processing potential token row %d/%d ---", i+1, len(token_rows))
+        if debug_enabled:
+            logging.debug("Row %d HTML snippet: %s ...", i+1, lxml.html.tostring(row_element, encoding='unicode')[:700])
 
         token_name = "N/A (Not Found)"
         expiration_date_str = "N/A (Not Found)"
 
         # Get token name
-        try:
-            name_element = row_element.find_element(By.CSS_SELECTOR, TOKEN_NAME_SELECTOR)
-            token_name_text = name_element.text.strip()
+        name_elements = _TOKEN_NAME_SEL(row_element)
+        if name_elements:
+            token_name_text = element_text(name_elements[0])
             token_name = token_name_text if token_name_text else "Unnamed Token (parsed empty)"
-            logging.info(f"Row {i+1}: Found token name '{token_name}' using selector '{TOKEN_NAME_SELECTOR}'")
-        except NoSuchElementException:
-            logging.warning(f"Row {i+1}: Token name element NOT found using selector '{TOKEN_NAME_SELECTOR}'.")
-            try:
-                child_elements_details = []
-                direct_children = row_element.find_elements(By.XPATH, "./*") 
-                for child_idx, child in enumerate(direct_children[:5]):
-                     child_elements_details.append(f"Direct Child {child_idx}: tag={child.tag_name}, text='{child.text[:30].strip() if child.text else ''}'")
-                logging.info(f"Row {i+1} Direct Child details for name search (first 5): {'; '.join(child_elements_details)}")
-            except Exception as e_child_debug:
-                logging.info(f"Row {i+1} Could not get detailed child elements for debugging: {e_child_debug}")
+            logging.debug("Row %d: Found token name '%s' using selector '%s'", i+1, token_name, TOKEN_NAME_SELECTOR)
+        else:
+            logging.warning("Row %d: Token name element NOT found using selector '%s'.", i+1, TOKEN_NAME_SELECTOR)
+            if debug_enabled:
+                child_elements_details = [
+                    f"Direct Child {child_idx}: tag={child.tag}, text='{element_text(child)[:30]}'"
+                    for child_idx, child in enumerate(row_element.xpath("./*")[:5])
+                ]
+                logging.debug("Row %d Direct Child details for name search (first 5): %s", i+1, '; '.join(child_elements_details))
 
         # Get expiration date
-        try:
-            # Attempt to find the expiration text using the new selector
-            expiration_element = row_element.find_element(By.CSS_SELECTOR, NEW_TOKEN_EXPIRATION_TEXT_SELECTOR)
-            expiration_text = expiration_element.text.strip()
-            logging.info(f"Row {i+1}: Found expiration text element using '{NEW_TOKEN_EXPIRATION_TEXT_SELECTOR}'. Raw text: '{expiration_text}'")
-
-            if "Expired on " in expiration_text:
-                expiration_date_str = expiration_text.split("Expired on ", 1)[1]
-                logging.info(f"Row {i+1}: Parsed 'Expired on' date: '{expiration_date_str}'")
-            elif "No expiration" in expiration_text: # Example, adjust if GitHub uses different phrasing
-                expiration_date_str = "No expiration"
-                logging.info(f"Row {i+1}: Parsed 'No expiration'.")
+        expiration_elements = _TOKEN_EXPIRATION_SEL(row_element)
+        if expiration_elements:
+            expiration_text = element_text(expiration_elements[0])
+            logging.debug("Row %d: Found expiration text element using '%s'. Raw text: '%s'", i+1, NEW_TOKEN_EXPIRATION_TEXT_SELECTOR, expiration_text)
+
+            # partition() finds the prefix and splits off the date in a single scan of the text.
+            _, expired_on, expired_date = expiration_text.partition(EXPIRED_ON_PREFIX)
+            if expired_on:
+                expiration_date_str = expired_date
+                logging.debug("Row %d: Parsed 'Expired on' date: '%s'", i+1, expiration_date_str)
+            elif NO_EXPIRATION in expiration_text: # Example, adjust if GitHub uses different phrasing
+                expiration_date_str = NO_EXPIRATION
+                logging.debug("Row %d: Parsed 'No expiration'.", i+1)
             # Add more elif conditions here if GitHub has other formats like "Expires in X days" that need specific parsing.
             # For now, we capture the raw text if it's not "Expired on " or "No expiration".
             else:
@@ -206,84 +391,263 @@ def scrape_tokens(driver):
                 # For this iteration, we'll take the text as is if it's not an "Expired on" format.
                 # Future improvements could parse "Expires in X days" to a specific date.
                 expiration_date_str = expiration_text
-                logging.info(f"Row {i+1}: Using raw expiration text as is (not 'Expired on' or 'No expiration' format): '{expiration_date_str}'")
+                logging.debug("Row %d: Using raw expiration text as is (not 'Expired on' or 'No expiration' format): '%s'", i+1, expiration_date_str)
 
-        except NoSuchElementException:
-            logging.warning(f"Row {i+1}: Expiration text element NOT found using selector '{NEW_TOKEN_EXPIRATION_TEXT_SELECTOR}'. This might mean the token has no expiration displayed in this format, or the selector needs an update.")
-            # Attempt to find a <relative-time> element as a fallback for "no expiration" or specific dates.
-            try:
-                relative_time_element = row_element.find_element(By.TAG_NAME, 'relative-time')
-                datetime_attr = relative_time_element.get_attribute('datetime')
+        else:
+            logging.warning("Row %d: Expiration text element NOT found using selector '%s'. This might mean the token has no expiration displayed in this format, or the selector needs an update.", i+1, NEW_TOKEN_EXPIRATION_TEXT_SELECTOR)
+            # Fall back to the row's <relative-time> element for "no expiration" or specific dates.
+            relative_time_elements = _RELATIVE_TIME_SEL(row_element)
+            if not relative_time_elements:
+                logging.warning("Row %d: Neither '%s' nor <relative-time> tag found. Setting expiration to 'N/A (Not Found)'.", i+1, NEW_TOKEN_EXPIRATION_TEXT_SELECTOR)
+                expiration_date_str = "N/A (Not Found)"
+            else:
+                datetime_attr = relative_time_elements[0].get('datetime')
                 if datetime_attr:
-                    dt_object = datetime.fromisoformat(datetime_attr.replace('Z', '+00:00'))
-                    expiration_date_str = dt_object.strftime('%Y-%m-%d')
-                    logging.info(f"Row {i+1}: Found expiration date '{expiration_date_str}' using <relative-time> tag's datetime attribute.")
+                    try:
+                        expiration_date_str = iso_date(datetime_attr)
+                        logging.debug("Row %d: Found expiration date '%s' using <relative-time> tag's datetime attribute.", i+1, expiration_date_str)
+                    except ValueError as e_rel_time:
+                        logging.error("Row %d: Error processing <relative-time> fallback for token '%s': %s", i+1, token_name, e_rel_time, exc_info=True)
+                        expiration_date_str = "Error parsing relative-time (see logs)"
                 else:
                     # If <relative-time> exists but has no datetime, check its text.
                     # It might say "No expiration" or similar.
-                    relative_time_text = relative_time_element.text.strip()
-                    if "no expiration" in relative_time_text.lower(): # Case-insensitive check
-                        expiration_date_str = "No expiration"
-                        logging.info(f"Row {i+1}: Found 'No expiration' in <relative-time> text: '{relative_time_text}'")
+                    relative_time_text = element_text(relative_time_elements[0])
+                    if _NO_EXPIRATION_LOWER in relative_time_text.lower(): # Case-insensitive check
+                        expiration_date_str = NO_EXPIRATION
+                        logging.debug("Row %d: Found 'No expiration' in <relative-time> text: '%s'", i+1, relative_time_text)
                     else:
                         expiration_date_str = relative_time_text if relative_time_text else "N/A (relative-time text empty)"
-                        logging.warning(f"Row {i+1}: <relative-time> tag found but 'datetime' attribute missing and text not recognized as 'no expiration'. Text: '{expiration_date_str}'")
-            except NoSuchElementException:
-                logging.warning(f"Row {i+1}: Neither '{NEW_TOKEN_EXPIRATION_TEXT_SELECTOR}' nor <relative-time> tag found. Setting expiration to 'N/A (Not Found)'.")
-                expiration_date_str = "N/A (Not Found)"
-            except Exception as e_rel_time:
-                logging.error(f"Row {i+1}: Error processing <relative-time> fallback for token '{token_name}': {e_rel_time}", exc_info=True)
-                expiration_date_str = "Error parsing relative-time (see logs)"
-
-        except Exception as e_expiry:
-            logging.error(f"Row {i+1}: General error parsing expiration for token '{token_name}' using '{NEW_TOKEN_EXPIRATION_TEXT_SELECTOR}': {e_expiry}", exc_info=True)
-            expiration_date_str = "Error parsing (see logs)"
+                        logging.warning("Row %d: <relative-time> tag found but 'datetime' attribute missing and text not recognized as 'no expiration'. Text: '%s'", i+1, expiration_date_str)
 
         if token_name != "N/A (Not Found)" and token_name != "Unnamed Token (parsed empty)":
-            tokens_data.append({"Token Name": token_name, "Expiration Date": expiration_date_str})
-            logging.info(f"Row {i+1}: ✔️ Successfully parsed and added to list: Name='{token_name}', Expiry='{expiration_date_str}'")
+            yield token_name, expiration_date_str
+            token_count += 1
+            logging.debug("Row %d: ✔️ Successfully parsed and written to the report: Name='%s', Expiry='%s'", i+1, token_name, expiration_date_str)
         else:
-            logging.warning(f"Row {i+1}: ⚠️ Skipped adding to list. Token Name was '{token_name}'. This row might not be a valid token or name parsing failed critically.")
-        logging.info(f"--- Finished processing row {i+1} ---")
-
-    if not tokens_data and len(token_rows or []) > 0 : # If rows were found but nothing was added
-        logging.warning("Potential token rows were found, but no data was successfully extracted into the list. Check parsing logic and HTML snippets in logs.")
-    elif not tokens_data: # This case is now mainly handled by the TimeoutException or if token_rows list becomes empty unexpectedly
-        logging.warning("No token data was successfully extracted into the list. The output CSV will be empty (except for headers).")
-    return tokens_data
-
-def save_to_csv(data, filename):
-    """Saves the scraped data to a CSV file."""
-    if not data:
-        logging.info("No data to save to CSV. Writing headers only.")
+            logging.warning("Row %d: ⚠️ Skipped writing to the report. Token Name was '%s'. This row might not be a valid token or name parsing failed critically.", i+1, token_name)
+        logging.debug("--- Finished processing row %d ---", i+1)
+
+    logging.info(f"Scraped {token_count} token(s) from {len(token_rows)} row(s).")
+    if not token_count and len(token_rows or []) > 0 : # If rows were found but nothing was written
+        logging.warning("Potential token rows were found, but no data was successfully extracted. Check parsing logic and HTML snippets in logs.")
+    elif not token_count: # No rows at all: the normal result for a fetched page without classic tokens (scrape_tokens returns earlier)
+        logging.warning("No token data was successfully extracted. The output CSV will be empty (except for headers).")
+
+def write_private_json(path, data, what):
+    """Writes `data` as JSON to `path`, readable by the owner only. Logs a warning naming `what` on failure.
+
+    Returns True if the file was written.
+    """
+    try:
+        make_private_dir(os.path.dirname(path))
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        return True
+    except OSError as e:
+        logging.warning(f"Could not save {what} to {path}: {e}")
+        return False
+
+def save_session_cookies(driver):
+    """Saves the browser's github.com cookies so later runs can fetch the tokens page without Chrome."""
+    # Domain, path and Secure are kept so requests only ever sends the session cookie to github.com over HTTPS.
+    cookies = [
+        {"name": c["name"], "value": c["value"], "domain": c["domain"], "path": c.get("path", "/"), "secure": c.get("secure", False)}
+        for c in driver.get_cookies() if c.get("domain", "").lstrip(".").endswith("github.com")
+    ]
+    if write_private_json(SESSION_COOKIES_FILE, cookies, "the GitHub session cookies"):
+        logging.info(f"Saved the GitHub session cookies to {SESSION_COOKIES_FILE} for browserless runs.")
+
+def delete_session_cookies():
+    """Deletes saved session cookies left over from a run with SAVE_SESSION_COOKIES=1."""
+    try:
+        os.remove(SESSION_COOKIES_FILE)
+        logging.info(f"SAVE_SESSION_COOKIES is not set; deleted the saved GitHub session cookies at {SESSION_COOKIES_FILE}.")
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logging.warning(f"Could not delete the saved GitHub session cookies at {SESSION_COOKIES_FILE}: {e}")
+
+def fetch_tokens_page_with_cookies(etag=None):
+    """Fetches the tokens page over plain HTTP with saved session cookies, sending `etag` as If-None-Match.
+
+    Returns (page, etag): page is the parsed lxml document, TOKENS_PAGE_NOT_MODIFIED if the page has not changed
+    since `etag`, or None when there are no saved cookies or they no longer authenticate.
+    """
+    try:
+        with open(SESSION_COOKIES_FILE, encoding="utf-8") as f:
+            cookies = json.load(f)
+    except (OSError, ValueError):
+        return None, None # No saved session yet
+
+    logging.info(f"Fetching {GITHUB_TOKENS_URL} with the saved session cookies...")
+    session = requests.Session()
+    for cookie in cookies:
+        session.cookies.set(cookie["name"], cookie["value"], domain=cookie["domain"], path=cookie["path"], secure=cookie["secure"])
+    session.headers["User-Agent"] = CHROME_USER_AGENT
+    headers = {"If-None-Match": etag} if etag else None
+    try:
+        # Redirects are not followed: the only one expected here is to the login page, i.e. an expired session.
+        response = session.get(GITHUB_TOKENS_URL, headers=headers, timeout=WAIT_TIMEOUT, allow_redirects=False)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        logging.warning(f"Could not fetch the tokens page with the saved session cookies: {e}")
+        return None, None
+
+    if response.status_code == 304:
+        return TOKENS_PAGE_NOT_MODIFIED, etag
+    if response.is_redirect:
+        logging.info("The saved session cookies have expired (redirected to log in); falling back to the browser.")
+        return None, None
+    tree = lxml.html.fromstring(response.text)
+    if not tree.xpath(TOKEN_PAGE_IDENTIFIER_ELEMENT_XPATH):
+        logging.info("The saved session cookies no longer reach the tokens page; falling back to the browser.")
+        return None, None
+    logging.info("✅ Fetched the 'Personal access tokens (classic)' page without starting Chrome.")
+    return tree, response.headers.get("ETag")
+
+def report_sha256(filename):
+    """Returns the SHA-256 hex digest of `filename`, or None if it cannot be read."""
+    try:
+        with open(filename, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+def load_tokens_page_etag():
+    """Returns the tokens page ETag saved with the current report, or None if the report has changed since."""
+    try:
+        with open(TOKENS_PAGE_CACHE_FILE, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cache.get("report_sha256") != report_sha256(OUTPUT_FILE):
+        return None # Report rewritten by another mode, edited or deleted; fetch the full page
+    return cache.get("etag")
+
+def save_tokens_page_etag(etag):
+    """Saves the tokens page `etag` together with a hash of the report just written from that page."""
+    write_private_json(TOKENS_PAGE_CACHE_FILE, {"etag": etag, "report_sha256": report_sha256(OUTPUT_FILE)}, "the tokens page cache")
+
+def list_org_classic_tokens(client, org, login):
+    """Returns (token_last_eight, name, expiration) for each classic PAT `login` has authorized for SSO in `org`."""
+    tokens = []
+    for credential in client.paginate(f"/orgs/{org}/credential-authorizations", {"login": login}):
+        # Fine-grained PATs, SSH keys and app tokens are listed too; only classic PATs are reported.
+        if credential.get("credential_type") != "personal access token":
+            continue
+        token_name = credential.get("authorized_credential_note") or f"Unnamed Token (ends in {credential.get('token_last_eight')})"
+        expires_at = credential.get("authorized_credential_expires_at")
+        if expires_at:
+            expiration_date_str = iso_date(expires_at)
+        else:
+            expiration_date_str = NO_EXPIRATION
+        tokens.append((credential.get("token_last_eight"), token_name, expiration_date_str))
+    logging.info(f"Organization '{org}': {len(tokens)} SSO-authorized classic token(s).")
+    return tokens
+
+def scrape_tokens_via_api(api_token, orgs, writer):
+    """Writes the authenticated user's SSO-authorized classic PATs in `orgs` to the CSV `writer`. Returns the count."""
+    logging.info(f"🔍 Fetching classic tokens from the GitHub API for organization(s): {', '.join(orgs)}...")
+    from github_api import GitHubApiClient # Only needed in API mode; browser runs never import it
+    client = GitHubApiClient(api_token, API_CACHE_FILE)
+    login = client.get_json("/user")[0]["login"]
+    logging.info(f"Authenticated to the GitHub API as '{login}'.")
+
+    # Organizations are listed one after another, as GitHub asks for requests on behalf of a single user to avoid
+    # its secondary rate limits. A token authorized in several organizations is reported once.
+    token_count = 0
+    seen_tokens = set()
+    for org in orgs:
+        for token_last_eight, token_name, expiration_date_str in list_org_classic_tokens(client, org, login):
+            if (token_last_eight, token_name) in seen_tokens:
+                continue
+            seen_tokens.add((token_last_eight, token_name))
+            writer.writerow((token_name, expiration_date_str))
+            token_count += 1
+
+    # The cache holds token metadata, so it is written owner-readable only like the other files in CACHE_DIR.
+    write_private_json(client.cache_file, client.cache, "the GitHub API cache")
+    logging.info(f"Found {token_count} classic token(s) via the GitHub API. This covers only tokens SSO-authorized for {', '.join(orgs)}; other classic tokens of the account are not listed.")
+    return token_count
+
+def log_api_forbidden(response):
+    """Logs why the GitHub API answered 403 Forbidden and what the user can do about it."""
+    logging.error(f"❌ The GitHub API denied access to {response.url} (HTTP 403).")
+    if response.headers.get("X-RateLimit-Remaining") == "0" or "rate limit" in response.text.lower():
+        logging.error("GitHub's API rate limit was still exceeded after waiting and retrying. Try again later.")
+    elif response.headers.get("X-GitHub-SSO"):
+        # e.g. "required; url=https://github.com/orgs/acme/sso?authorization_request=..."
+        sso_url = response.headers["X-GitHub-SSO"].partition("url=")[2]
+        logging.error("The organization enforces SAML SSO and GITHUB_TOKEN is not authorized for it. "
+                      f"Authorize the token for SSO{f' at {sso_url}' if sso_url else ' in its settings'} and run again.")
     else:
-        logging.info(f"💾 Saving {len(data)} token(s) to {filename}...")
-    
+        logging.error("Listing SSO credential authorizations requires an owner of the organization and a GITHUB_TOKEN with the read:org scope. "
+                      "Unset GITHUB_TOKEN or GITHUB_ORG to scrape the tokens page in the browser instead.")
+
+@contextmanager
+def open_csv_report(filename):
+    """Opens the CSV report, writes the header row and yields a csv.writer so rows are saved as they are scraped.
+
+    Rows go to a temporary file next to `filename`, which replaces the report only once the `with` body finishes.
+    If scraping fails part-way, the previous report is left as it was instead of being truncated.
+    """
+    logging.info(f"💾 Writing tokens to {filename}...")
+    temp_filename = f"{filename}.tmp"
     try:
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ["Token Name", "Expiration Date"]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            if data: 
-                writer.writerows(data)
-        logging.info(f"✅ Data (or headers) successfully saved to {filename}.")
-    except IOError as e:
-        logging.error(f"❌ IOError saving data to CSV: {e}", exc_info=True)
-    except Exception as e:
-        logging.error(f"❌ An unexpected error occurred while saving to CSV: {e}", exc_info=True)
+        # A 1 MiB buffer batches the per-row writes into one or two write() calls for the whole report.
+        with open(temp_filename, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(CSV_HEADERS)
+            yield writer
+        os.replace(temp_filename, filename)
+    except BaseException:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        logging.warning(f"The report was not completed; {filename} was left unchanged.")
+        raise
+    logging.info(f"✅ Report saved to {filename}.")
 
 def main():
     """Main function to orchestrate the scraping process."""
+    log_listener = start_log_listener()
     logging.info("--- GitHub Classic PAT Scraper Initializing ---")
     driver = None
     try:
+        if GITHUB_API_TOKEN and GITHUB_ORGS:
+            try:
+                with open_csv_report(OUTPUT_FILE) as writer:
+                    scrape_tokens_via_api(GITHUB_API_TOKEN, GITHUB_ORGS, writer)
+            except requests.HTTPError as e:
+                if e.response is None or e.response.status_code != 403:
+                    raise
+                log_api_forbidden(e.response)
+            return
+
+        if SAVE_SESSION_COOKIES:
+            tokens_page, etag = fetch_tokens_page_with_cookies(load_tokens_page_etag())
+            if tokens_page is TOKENS_PAGE_NOT_MODIFIED:
+                logging.info(f"✅ The tokens page has not changed since the last run; {OUTPUT_FILE} is up to date.")
+                return
+            if tokens_page is not None:
+                with open_csv_report(OUTPUT_FILE) as writer:
+                    writer.writerows(parse_token_rows(tokens_page))
+                if etag:
+                    save_tokens_page_etag(etag)
+                return
+        else:
+            delete_session_cookies()
+
         driver = setup_driver()
         if not check_login_and_navigate(driver):
             logging.error("Could not verify login or navigate to the correct page. Exiting.")
             return
+        if SAVE_SESSION_COOKIES:
+            save_session_cookies(driver)
 
-        scraped_tokens = scrape_tokens(driver)
-        save_to_csv(scraped_tokens, OUTPUT_FILE)
+        with open_csv_report(OUTPUT_FILE) as writer:
+            writer.writerows(scrape_tokens(driver))
 
     except Exception as e:
         logging.error(f"🚨 An critical error occurred in the main process: {e}", exc_info=True)
@@ -292,8 +656,19 @@ def main():
             logging.info("Closing WebDriver...")
             driver.quit()
         logging.info("--- GitHub Classic PAT Scraper Finished ---")
+        stop_log_listener(log_listener)
+
+def parse_args():
+    """Parses command-line options."""
+    parser = argparse.ArgumentParser(description="Inventory the classic personal access tokens of your GitHub account.")
+    parser.add_argument("--debug", action="store_true",
+                        help="log per-row parsing details and HTML snippets (same as SCRAPER_DEBUG=1)")
+    return parser.parse_args()
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.debug:
+        logging.getLogger().setLevel(logging.DEBUG)
     os.makedirs("output", exist_ok=True)
     os.makedirs("logs", exist_ok=True)
     main()